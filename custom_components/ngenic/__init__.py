@@ -1,5 +1,7 @@
 """Support for Ngenic Tune"""
+import importlib
 import logging
+import time
 
 import voluptuous as vol
 
@@ -13,8 +15,13 @@ from .config_flow import configured_instances
 from .const import (
     DOMAIN,
     DATA_CLIENT,
-    DATA_CONFIG
+    DATA_CONFIG,
+    DATA_BREAKER,
+    DATA_SERIES,
+    PLATFORMS
 )
+from .breaker import CircuitBreaker
+from .client import async_create_client
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,7 +39,6 @@ CONFIG_SCHEMA = vol.Schema(
 async def async_setup(hass, config):
     """Setup the Ngenic component"""
     hass.data[DOMAIN] = {}
-    hass.data[DOMAIN][DATA_CLIENT] = {}
     
     if DOMAIN not in config:
         return True
@@ -59,23 +65,47 @@ async def async_setup(hass, config):
 
     return True
 
+def _import_platform_dependencies():
+    """Import the platforms and the modules they depend on.
+    The platforms, stream and aggregate modules import ngenicpy and httpx
+    at module level, which is slow. This is executed in the executor
+    so that those imports don't block the event loop.
+    Home Assistant will find the platforms already imported when they are set up.
+    """
+    for module in ("aggregate", *PLATFORMS):
+        importlib.import_module(".%s" % module, __name__)
+
 async def async_setup_entry(hass, config_entry):
-    from ngenicpy import AsyncNgenic
-    ngenic = AsyncNgenic(
-        token=config_entry.data[CONF_TOKEN]
-    )
+    start = time.monotonic()
+
+    await hass.async_add_executor_job(_import_platform_dependencies)
+    _LOGGER.debug("Imported ngenicpy and platforms in %.3f seconds" % (time.monotonic() - start))
+
+    from .aggregate import SeriesCache
+
+    ngenic = await async_create_client(hass, config_entry.data[CONF_TOKEN])
+
+    # Each config entry (API token) gets its own client, circuit breaker and series cache
+    breaker = CircuitBreaker()
+    hass.data[DOMAIN][config_entry.entry_id] = {
+        DATA_CLIENT: ngenic,
+        DATA_BREAKER: breaker,
+        DATA_SERIES: SeriesCache(breaker)
+    }
 
-    hass.data[DOMAIN][DATA_CLIENT] = ngenic
+    # Setup all platforms concurrently
+    await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
 
-    for component in ("sensor", "climate"):
-        hass.async_add_job(hass.config_entries.async_forward_entry_setup(config_entry, component))
+    _LOGGER.debug("Setup of Ngenic entry took %.3f seconds" % (time.monotonic() - start))
 
     return True
 
 async def async_unload_entry(hass, config_entry):
-    for component in ("sensor", "climate"):
-        await hass.config_entries.async_forward_entry_unload(config_entry, component)
+    unload_ok = await hass.config_entries.async_unload_platforms(config_entry, PLATFORMS)
 
-    await hass.data[DOMAIN][DATA_CLIENT].async_close()
+    # Keep the client if any platform is still loaded, its entities still use it
+    if unload_ok:
+        entry_data = hass.data[DOMAIN].pop(config_entry.entry_id)
+        await entry_data[DATA_CLIENT].async_close()
 
-    return True
\ No newline at end of file
+    return unload_ok
\ No newline at end of file
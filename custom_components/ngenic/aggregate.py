@@ -0,0 +1,102 @@
+"""Local aggregation of Ngenic measurement series.
+
+A series of measurements is stored in compact typed arrays (`array('d')`)
+instead of a list of dicts, so a long period takes 8 bytes per measurement.
+
+The `SeriesCache` lets several sensors derive different values from the
+same series, so a derived sensor doesn't need an extra API call.
+"""
+import asyncio
+import logging
+import math
+import time
+from array import array
+
+from .const import SERIES_MAX_AGE
+from .stream import async_iter_measurements
+
+_LOGGER = logging.getLogger(__name__)
+
+class MeasurementSeries:
+    """A series of measurement values, stored as floats."""
+
+    def __init__(self, values=None):
+        self._values = values if values is not None else array("d")
+
+    @classmethod
+    async def async_from_measurements(cls, measurements):
+        """Build a series from an async iterator of measurements.
+        Measurements are appended one by one, so the raw measurements are
+        never held in memory all at once.
+        """
+        series = cls()
+        async for measurement in measurements:
+            series.append(measurement["value"])
+        return series
+
+    def append(self, value):
+        """Append a measurement value."""
+        self._values.append(value)
+
+    def __len__(self):
+        return len(self._values)
+
+    def sum(self):
+        """Sum of all values, 0 if the series is empty."""
+        return math.fsum(self._values)
+
+class SeriesCache:
+    """Share fetched series between sensors.
+    Sensors asking for the same node, type and period within `max_age`
+    get the same series. Concurrent requests for the same series will
+    wait for a single API call.
+
+    The cache reports the outcome of each API call to the circuit breaker,
+    so a shared call counts once, and a cached series is never taken as
+    proof that the API has recovered.
+    """
+
+    def __init__(self, breaker, max_age=SERIES_MAX_AGE):
+        self._breaker = breaker
+        self._max_age = max_age.total_seconds()
+        self._series = {}
+
+    async def async_get(self, node, measurement_type, from_dt, to_dt, period=None):
+        """Get a series, fetching it from the API if not cached."""
+        now = time.monotonic()
+
+        # forget old series, so periods that have passed don't linger
+        for old_key in [k for k, (fetched, _) in self._series.items() if now - fetched > self._max_age]:
+            del self._series[old_key]
+
+        key = (node.uuid(), measurement_type, from_dt, to_dt, period)
+
+        # While the breaker is not closed, the only caller let through is the probe,
+        # which must reach the API
+        if key not in self._series or not self._breaker.is_closed:
+            _LOGGER.debug("Fetch series (node=%s, type=%s, from=%s, to=%s, period=%s)" %
+                (node.uuid(), measurement_type, from_dt, to_dt, period))
+            task = asyncio.ensure_future(self._async_fetch(node, measurement_type, from_dt, to_dt, period))
+            self._series[key] = (now, task)
+
+        task = self._series[key][1]
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            # don't cache failures
+            if self._series.get(key, (None, None))[1] is task:
+                del self._series[key]
+            raise
+
+    async def _async_fetch(self, node, measurement_type, from_dt, to_dt, period):
+        """Fetch a series and report the outcome to the circuit breaker."""
+        try:
+            series = await MeasurementSeries.async_from_measurements(
+                async_iter_measurements(node, measurement_type, from_dt, to_dt, period)
+            )
+        except Exception:
+            self._breaker.record_failure()
+            raise
+
+        self._breaker.record_success()
+        return series
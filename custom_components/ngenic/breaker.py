@@ -0,0 +1,128 @@
+"""Circuit breaker for requests against the Ngenic API."""
+import logging
+import random
+import time
+
+from .const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_BACKOFF_MIN,
+    BREAKER_BACKOFF_MAX,
+    BREAKER_RESUME_WINDOW
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+class CircuitBreaker:
+    """Track API failures for a config entry.
+
+    Entities should ask `allow_request` before fetching, and report the
+    outcome with `record_success` or `record_failure`.
+
+    When open, a single probe is let through once the backoff has passed.
+    The backoff doubles for every failed probe and is jittered so that
+    several Home Assistant instances don't retry in lockstep.
+    If the probe never reports back (e.g. it was cancelled), a new probe
+    is let through once it has been outstanding for longer than the backoff.
+    """
+
+    def __init__(self,
+                 failure_threshold=BREAKER_FAILURE_THRESHOLD,
+                 backoff_min=BREAKER_BACKOFF_MIN,
+                 backoff_max=BREAKER_BACKOFF_MAX,
+                 resume_window=BREAKER_RESUME_WINDOW):
+        self._failure_threshold = failure_threshold
+        self._backoff_min = backoff_min.total_seconds()
+        self._backoff_max = backoff_max.total_seconds()
+        self._resume_window = resume_window.total_seconds()
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._attempt = 0
+        self._backoff = 0
+        self._next_probe = 0
+        self._probe_started = 0
+        self._listeners = []
+
+    @property
+    def state(self):
+        return self._state
+
+    @property
+    def is_closed(self):
+        return self._state == STATE_CLOSED
+
+    def allow_request(self):
+        """Return True if a request may be sent to the API.
+        While open, this will return True only once when the backoff has
+        passed, which turns that request into the probe.
+        """
+        if self._state == STATE_CLOSED:
+            return True
+
+        now = time.monotonic()
+
+        if self._state == STATE_OPEN and now >= self._next_probe:
+            _LOGGER.debug("Circuit breaker half open, sending probe")
+        elif self._state == STATE_HALF_OPEN and now - self._probe_started > self._backoff:
+            _LOGGER.debug("Probe did not report back, sending a new probe")
+        else:
+            return False
+
+        self._state = STATE_HALF_OPEN
+        self._probe_started = now
+        return True
+
+    def record_success(self):
+        """Close the breaker.
+        If the breaker was open, all listeners are told to resume
+        with a random delay to spread the requests over the resume window.
+        """
+        recovered = self._state != STATE_CLOSED
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._attempt = 0
+
+        if recovered:
+            _LOGGER.info("Ngenic API recovered, resuming updates")
+            for listener in list(self._listeners):
+                listener(random.uniform(0, self._resume_window))
+
+    def record_failure(self):
+        """Count a failed request and open the breaker if needed."""
+        self._failures += 1
+
+        if self._state == STATE_HALF_OPEN:
+            self._open()
+        elif self._state == STATE_CLOSED and self._failures >= self._failure_threshold:
+            self._open()
+
+    def add_listener(self, listener):
+        """Add a listener that is called with a delay (in seconds) when the breaker recovers.
+        Returns a function that, when executed, will remove the listener.
+        """
+        self._listeners.append(listener)
+
+        def remove_listener():
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return remove_listener
+
+    def _open(self):
+        """Open the breaker and schedule the next probe.
+        Uses "equal jitter": half of the exponential backoff is fixed
+        and the other half is random.
+        """
+        self._backoff = min(self._backoff_max, self._backoff_min * 2 ** self._attempt)
+        delay = self._backoff / 2 + random.uniform(0, self._backoff / 2)
+        self._attempt += 1
+        self._state = STATE_OPEN
+        self._next_probe = time.monotonic() + delay
+
+        _LOGGER.warning(
+            "Ngenic API failed %d times in a row, pausing updates for %d seconds" %
+            (self._failures, delay)
+        )
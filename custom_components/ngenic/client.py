@@ -0,0 +1,14 @@
+"""Creation of the Ngenic API client."""
+
+def _import_and_create(token):
+    """Import ngenicpy and create an async client.
+    Importing ngenicpy (and httpx) and creating the http client, which loads
+    the SSL certificates, are both blocking. Run this in the executor.
+    """
+    from ngenicpy import AsyncNgenic
+
+    return AsyncNgenic(token=token)
+
+async def async_create_client(hass, token):
+    """Create an async Ngenic client without blocking the event loop."""
+    return await hass.async_add_executor_job(_import_and_create, token)
@@ -3,7 +3,6 @@ from datetime import timedelta
 
 from ngenicpy.models.measurement import MeasurementType
 
-from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.components.climate import ClimateEntity
 from homeassistant.components.climate.const import (
     SUPPORT_TARGET_TEMPERATURE,
@@ -16,21 +15,27 @@ from homeassistant.const import (
 
 from .const import (
     DOMAIN,
-    DATA_CLIENT
+    DATA_CLIENT,
+    DATA_BREAKER
 )
+from .device import tune_device_info
+from .entity import StaleStateMixin
 
 _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up the sensor platform."""
 
-    ngenic = hass.data[DOMAIN][DATA_CLIENT]
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    ngenic = entry_data[DATA_CLIENT]
+    breaker = entry_data[DATA_BREAKER]
 
-    devices = []
-    
     for tmp_tune in await ngenic.async_tunes():
+        devices = []
+
         # listing tunes contain less information than when querying a single tune
         tune = await ngenic.async_tune(tmp_tune.uuid())
+        device_info = tune_device_info(tune.uuid(), "Ngenic Tune %s" % tmp_tune["tuneName"])
 
         # rooms with control sensors can be found either directly on the tune, or by looking at the activeControl
         # property on the room object. if roomToControlUuid is set, it takes precedence and the activeControl
@@ -53,7 +58,9 @@ async def async_setup_entry(hass, entry, async_add_entities):
             device = NgenicTune(
                 hass,
                 ngenic,
+                breaker,
                 tune,
+                device_info,
                 control_room,
                 control_node
             )
@@ -66,23 +73,23 @@ async def async_setup_entry(hass, entry, async_add_entities):
 
             devices.append(device)
 
-    async_add_entities(devices)
+        # Add the Tune's entities as soon as the Tune is discovered
+        async_add_entities(devices)
 
-class NgenicTune(ClimateEntity):
+class NgenicTune(StaleStateMixin, ClimateEntity):
     """Representation of an Ngenic Thermostat"""
 
-    def __init__(self, hass, ngenic, tune, control_room, control_node):
+    def __init__(self, hass, ngenic, breaker, tune, device_info, control_room, control_node):
         """Initialize the thermostat."""
-        self._hass = hass
-        self._available = False
+        self._init_stale_state(hass, breaker, timedelta(minutes=5))
         self._ngenic = ngenic
         self._name =  "Ngenic Tune %s" % (tune["name"])
         self._tune = tune
+        self._device_info = device_info
         self._room = control_room
         self._node = control_node
         self._current_temperature = None
         self._target_temperature = None
-        self._updater = None
 
     @property
     def supported_features(self):
@@ -94,14 +101,15 @@ class NgenicTune(ClimateEntity):
         """Return the name of the Tune."""
         return self._name
 
-    @property
-    def available(self):
-        return self._available
-
     @property
     def unique_id(self):
         return "%s-%s" % (self._node.uuid(), "climate")
 
+    @property
+    def device_info(self):
+        """Return the device (Tune) this thermostat belongs to."""
+        return self._device_info
+
     @property
     def temperature_unit(self):
         """Return the unit of measurement which this thermostat uses."""
@@ -127,17 +135,6 @@ class NgenicTune(ClimateEntity):
         """Must be implemented"""
         return [HVAC_MODE_HEAT]
 
-    async def async_will_remove_from_hass(self):
-        """Remove updater when sensor is removed."""
-        if self._updater:
-            self._updater()
-            self._updater = None
-
-    def _setup_updater(self):
-        """Setup a timer that will execute an update every update interval"""
-        # async_track_time_interval returns a function that, when executed, will remove the timer
-        self._updater = async_track_time_interval(self._hass, self._async_update, timedelta(minutes=5))
-
     async def async_set_temperature(self, **kwargs):
         """Set new target temperature."""
         temperature = kwargs.get(ATTR_TEMPERATURE)
@@ -152,16 +149,19 @@ class NgenicTune(ClimateEntity):
         """Fetch new state data from the sensor.
         This is the only method that should fetch new data for Home Assistant.
         """
+        if not self._breaker.allow_request():
+            # The API is failing, keep the last known state but flag it as stale
+            self._mark_stale()
+            return
+
         try:
             current = await self._node.async_measurement(MeasurementType.TEMPERATURE)
             target_room = await self._tune.async_room(self._room.uuid())
-            self._available = True
-        except Exception:
-            # Don't throw an exception if a sensor fails to update.
-            # Instead, make the sensor unavailable.
-            _LOGGER.exception("Failed to update climate '%s'" % self.unique_id)
-            self._available = False
+        except Exception as err:
+            self._handle_failure(err)
             return
 
+        self._mark_fresh()
+
         self._current_temperature = round(current["value"], 1)
         self._target_temperature = round(target_room["targetTemperature"], 1)
@@ -10,11 +10,9 @@ from homeassistant.const import (
     CONF_TOKEN
 )
 
+from .client import async_create_client
 from .const import DOMAIN
-from .errors import AlreadyConfigured, NoTunes
-
-from ngenicpy import Ngenic
-from ngenicpy.exceptions import ClientException
+from .errors import AlreadyConfigured, NoTunes, BadToken
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,6 +23,27 @@ def configured_instances(hass):
         entry.data[CONF_TOKEN] for entry in hass.config_entries.async_entries(DOMAIN)
     )
 
+async def async_get_tune_name(hass, token):
+    """Get the Tune name for an API token.
+    Returns None if there are no Tunes, and raises BadToken if the token was rejected.
+    """
+    ngenic = await async_create_client(hass, token)
+
+    # ngenicpy have already been imported by async_create_client
+    from ngenicpy.exceptions import ClientException
+
+    try:
+        tune_name = None
+
+        for tune in await ngenic.async_tunes() or []:
+            tune_name = tune["tuneName"]
+
+        return tune_name
+    except ClientException as exc:
+        raise BadToken from exc
+    finally:
+        await ngenic.async_close()
+
 @config_entries.HANDLERS.register(DOMAIN)
 class FlowHandler(config_entries.ConfigFlow):
     
@@ -45,15 +64,8 @@ class FlowHandler(config_entries.ConfigFlow):
                 if user_input[CONF_TOKEN] in configured_instances(self.hass):
                     raise AlreadyConfigured
 
-                ngenic = Ngenic(
-                    token=user_input[CONF_TOKEN]
-                )
+                tune_name = await async_get_tune_name(self.hass, user_input[CONF_TOKEN])
 
-                tune_name = None
-                
-                for tune in ngenic.tunes():
-                    tune_name = tune["tuneName"]
-        
                 if tune_name is None:
                     raise NoTunes
 
@@ -61,7 +73,7 @@ class FlowHandler(config_entries.ConfigFlow):
                     title=tune_name, data=user_input
                 )
 
-            except ClientException:
+            except BadToken:
                 errors["base"] = "bad_token"
 
             except AlreadyConfigured:
@@ -4,9 +4,37 @@ DOMAIN = "ngenic"
 DATA_CLIENT = "data_client"
 DATA_CONFIG = "config"
 
+PLATFORMS = ["sensor", "climate"]
+
 """
 How often to re-scan sensor information.
 From API doc: Tune system Nodes generally report data in intervals of five 
 minutes, so there is no point in polling the API for new data at a higher rate.
 """
 SCAN_INTERVAL = timedelta(minutes=5)
+
+DATA_BREAKER = "breaker"
+
+ATTR_STALE = "stale"
+
+"""
+Circuit breaker settings.
+The breaker opens after this many consecutive failed requests against the API.
+While open, a single probe request is allowed after an exponentially growing,
+jittered delay between the min and max backoff. Once a probe succeeds, entities
+that missed updates will refresh at a random point within the resume window.
+"""
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_BACKOFF_MIN = timedelta(seconds=30)
+BREAKER_BACKOFF_MAX = timedelta(minutes=30)
+BREAKER_RESUME_WINDOW = timedelta(minutes=2)
+
+DATA_SERIES = "series"
+
+"""
+Derived sensors are computed from a series of measurements for today,
+divided into periods (ISO 8601:2004 duration format). A fetched series is
+shared between sensors on the same node for at most SERIES_MAX_AGE.
+"""
+SERIES_PERIOD = "PT1H"
+SERIES_MAX_AGE = timedelta(minutes=1)
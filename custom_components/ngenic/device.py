@@ -0,0 +1,25 @@
+"""Device registry grouping for Ngenic Tunes and nodes."""
+from .const import DOMAIN
+
+MANUFACTURER = "Ngenic"
+
+def tune_device_info(tune_uuid, name):
+    """Get device info for a Tune.
+    Nodes are connected to the Tune device through `via_device`.
+    """
+    return {
+        "identifiers": {(DOMAIN, tune_uuid)},
+        "name": name,
+        "manufacturer": MANUFACTURER,
+        "model": "Tune"
+    }
+
+def node_device_info(tune_uuid, node, name):
+    """Get device info for a node (sensor, controller, Track etc)."""
+    return {
+        "identifiers": {(DOMAIN, node.uuid())},
+        "name": name,
+        "manufacturer": MANUFACTURER,
+        "model": node.get_type().name.capitalize(),
+        "via_device": (DOMAIN, tune_uuid)
+    }
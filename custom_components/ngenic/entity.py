@@ -0,0 +1,113 @@
+"""Shared behaviour for Ngenic entities."""
+import logging
+
+from homeassistant.helpers.event import async_track_time_interval, async_call_later
+
+from .const import ATTR_STALE
+
+_LOGGER = logging.getLogger(__name__)
+
+class StaleStateMixin:
+    """Keep the last known state while the API is failing.
+
+    Entities using this mixin must call `_init_stale_state` in their
+    constructor and implement `_async_update`, which should call
+    `_mark_fresh` after a successful fetch and `_handle_failure` after a failed one.
+    """
+
+    def _init_stale_state(self, hass, breaker, update_interval):
+        self._hass = hass
+        self._breaker = breaker
+        self._update_interval = update_interval
+        # an entity is available once it got a state, and stays available while stale
+        self._available = False
+        self._stale = False
+        self._updater = None
+        self._resume_listener = None
+        self._resume = None
+
+    @property
+    def available(self):
+        return self._available
+
+    @property
+    def extra_state_attributes(self):
+        """Flag the state as stale when it could not be refreshed."""
+        return {ATTR_STALE: self._stale}
+
+    async def async_will_remove_from_hass(self):
+        """Remove updater when entity is removed."""
+        if self._updater:
+            self._updater()
+            self._updater = None
+
+        if self._resume_listener:
+            self._resume_listener()
+            self._resume_listener = None
+
+        if self._resume:
+            self._resume()
+            self._resume = None
+
+    def _setup_updater(self):
+        """Setup a timer that will execute an update every update interval"""
+        # async_track_time_interval returns a function that, when executed, will remove the timer
+        self._updater = async_track_time_interval(self._hass, self._async_update, self._update_interval)
+        self._resume_listener = self._breaker.add_listener(self._schedule_resume)
+
+    def _schedule_resume(self, delay):
+        """Refresh a stale entity after the circuit breaker has recovered.
+        The breaker picks a random delay for every entity so they
+        don't all hit the API at once.
+        """
+        if not self._stale or self._resume:
+            return
+
+        async def resume(event_time):
+            self._resume = None
+            # another update (e.g. the probe) may have refreshed the entity meanwhile
+            if self._stale:
+                await self._async_update()
+
+        self._resume = async_call_later(self._hass, delay, resume)
+
+    def _mark_fresh(self):
+        """Clear the stale flag after a successful fetch.
+        The flag is cleared before reporting to the circuit breaker,
+        so an entity that closes the breaker doesn't schedule a resume for itself.
+        """
+        self._available = True
+        self._stale = False
+        self._record_success()
+
+    def _record_success(self):
+        """Report a successful fetch to the circuit breaker."""
+        self._breaker.record_success()
+
+    def _record_failure(self):
+        """Report a failed fetch to the circuit breaker."""
+        self._breaker.record_failure()
+
+    def _handle_failure(self, err):
+        """Handle a failed fetch.
+        Don't throw an exception if an entity fails to update.
+        Instead, keep the last known state (if any) and flag it as stale.
+        Only the first failure is logged with a traceback to avoid flooding the log.
+        """
+        if self._breaker.is_closed and not self._stale:
+            _LOGGER.exception("Failed to update '%s'" % self.unique_id)
+        else:
+            _LOGGER.debug("Failed to update '%s': %s" % (self.unique_id, err))
+        self._record_failure()
+        self._mark_stale()
+
+    def _mark_stale(self):
+        """Keep the last known state, but flag it as stale.
+        An entity that never got a state will be unavailable.
+        """
+        was_stale = self._stale
+        self._stale = True
+
+        # self.hass is loaded once the entity have been setup
+        if not was_stale and self.hass:
+            self.schedule_update_ha_state()
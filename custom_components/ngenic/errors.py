@@ -10,4 +10,7 @@ class AlreadyConfigured(NgenicException):
     """Device is already configured."""
 
 class NoTunes(NgenicException):
-    """No tunes."""
\ No newline at end of file
+    """No tunes."""
+
+class BadToken(NgenicException):
+    """API token was rejected."""
@@ -1,7 +1,7 @@
+import asyncio
 import logging
 from datetime import datetime, timedelta
 
-from ngenicpy import Ngenic
 from ngenicpy.models.node import NodeType
 from ngenicpy.models.measurement import MeasurementType
 
@@ -15,14 +15,20 @@ from homeassistant.const import (
     POWER_WATT
 )
 from homeassistant.components.sensor import STATE_CLASS_MEASUREMENT, STATE_CLASS_TOTAL_INCREASING, SensorEntity
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers import device_registry as dr
 import homeassistant.util.dt as dt_util
 
 from .const import (
     DOMAIN,
     DATA_CLIENT,
+    DATA_BREAKER,
+    DATA_SERIES,
+    SERIES_PERIOD,
     SCAN_INTERVAL
 )
+from .device import tune_device_info, node_device_info
+from .entity import StaleStateMixin
+from .stream import async_last_measurement
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -87,8 +93,14 @@ async def get_measurement_value(node, **kwargs):
     """Get measurement 
     This is a wrapper around the measurement API to gather
     parsing and error handling in a single place.
+
+    When a period is given the API returns a list of measurements,
+    which is streamed so that only the last measurement is kept in memory.
     """
-    measurement = await node.async_measurement(**kwargs)
+    if kwargs.get("from_dt") is not None:
+        measurement = await async_last_measurement(node, **kwargs)
+    else:
+        measurement = await node.async_measurement(**kwargs)
     if not measurement:
         # measurement API will return None if no measurements were found for the period
         _LOGGER.info("Measurement not found for period, this is expected when data have not been gathered for the period (type=%s, from=%s, to=%s)" % 
@@ -100,25 +112,29 @@ async def get_measurement_value(node, **kwargs):
         )
         measurement_val = 0
     else:
-        if isinstance(measurement, list):
-            # using datetime will return a list of measurements
-            # we'll use the last item in that list
-            measurement_val = measurement[-1]["value"]
-        else:
-            measurement_val = measurement["value"]
+        measurement_val = measurement["value"]
 
     return measurement_val
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up the sensor platform."""
-    ngenic = hass.data[DOMAIN][DATA_CLIENT]
-
-    devices = []
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    ngenic = entry_data[DATA_CLIENT]
+    breaker = entry_data[DATA_BREAKER]
+    series_cache = entry_data[DATA_SERIES]
+    device_registry = dr.async_get(hass)
 
     for tune in await ngenic.async_tunes():
+        # Register the Tune so that the nodes can refer to it
+        device_registry.async_get_or_create(
+            config_entry_id=config_entry.entry_id,
+            **tune_device_info(tune.uuid(), "Ngenic Tune %s" % tune["tuneName"])
+        )
+
         rooms = await tune.async_rooms()
 
         for node in await tune.async_nodes():
+            devices = []
             node_name = "Ngenic %s" % node.get_type().name.lower()
 
             if node.get_type() == NodeType.SENSOR:
@@ -128,13 +144,18 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
                     if room["nodeUuid"] == node.uuid():
                         node_name = "%s %s" % (node_name, room["name"])
 
+            # All entities of a node are grouped under one device
+            device_info = node_device_info(tune.uuid(), node, node_name)
+
             measurement_types = await node.async_measurement_types()
             if MeasurementType.TEMPERATURE in measurement_types:
                 devices.append(
                     NgenicTempSensor(
                         hass,
                         ngenic,
+                        breaker,
                         node,
+                        device_info,
                         node_name,
                         timedelta(minutes=5),
                         MeasurementType.TEMPERATURE
@@ -149,7 +170,9 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
                     NgenicTempSensor(
                         hass,
                         ngenic,
+                        breaker,
                         node,
+                        device_info,
                         node_name,
                         timedelta(minutes=5),
                         MeasurementType.CONTROL_VALUE
@@ -161,7 +184,9 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
                     NgenicHumiditySensor(
                         hass,
                         ngenic,
+                        breaker,
                         node,
+                        device_info,
                         node_name,
                         timedelta(minutes=5),
                         MeasurementType.HUMIDITY
@@ -173,7 +198,9 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
                     NgenicPowerSensor(
                         hass,
                         ngenic,
+                        breaker,
                         node,
+                        device_info,
                         node_name,
                         timedelta(minutes=1),
                         MeasurementType.POWER_KW
@@ -185,7 +212,23 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
                     NgenicEnergySensor(
                         hass,
                         ngenic,
+                        breaker,
+                        series_cache,
+                        node,
+                        device_info,
+                        node_name,
+                        timedelta(minutes=10),
+                        MeasurementType.ENERGY_KWH
+                    )
+                )
+                devices.append(
+                    NgenicAveragePowerSensor(
+                        hass,
+                        ngenic,
+                        breaker,
+                        series_cache,
                         node,
+                        device_info,
                         node_name,
                         timedelta(minutes=10),
                         MeasurementType.ENERGY_KWH
@@ -195,7 +238,9 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
                     NgenicEnergySensorMonth(
                         hass,
                         ngenic,
+                        breaker,
                         node,
+                        device_info,
                         node_name,
                         timedelta(minutes=20),
                         MeasurementType.ENERGY_KWH
@@ -205,46 +250,44 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
                     NgenicEnergySensorLastMonth(
                         hass,
                         ngenic,
+                        breaker,
                         node,
+                        device_info,
                         node_name,
                         timedelta(minutes=60),
                         MeasurementType.ENERGY_KWH
                     )
                 )
 
-    for device in devices:
-        # Initial update (will not update hass state)
-        await device._async_update()
+            # Initial update (will not update hass state)
+            # Sensors on the same node may share a series, so update them together
+            await asyncio.gather(*[device._async_update() for device in devices])
 
-        # Setup update timer
-        device._setup_updater()
+            for device in devices:
+                # Setup update timer
+                device._setup_updater()
 
-    # Add entities to hass (and trigger a state update)
-    async_add_entities(devices, update_before_add=True)
+            # Add the node's entities to hass as soon as the node is discovered.
+            # The initial update is used as state, so there's no need to update before add.
+            async_add_entities(devices)
 
-class NgenicSensor(SensorEntity):
+class NgenicSensor(StaleStateMixin, SensorEntity):
     """Representation of an Ngenic Sensor"""
     
-    def __init__(self, hass, ngenic, node, name, update_interval, measurement_type):
-        self._hass = hass
+    def __init__(self, hass, ngenic, breaker, node, device_info, name, update_interval, measurement_type):
+        self._init_stale_state(hass, breaker, update_interval)
         self._state = None
-        self._available = False
         self._ngenic = ngenic
         self._name = name
         self._node = node
-        self._update_interval = update_interval
+        self._device_info = device_info
         self._measurement_type = measurement_type
-        self._updater = None
 
     @property
     def name(self):
         """Return the name of the sensor."""
         return "%s %s" % (self._name, self.device_class)
 
-    @property
-    def available(self):
-        return self._available
-
     @property
     def state(self):
         """Return the state of the sensor."""
@@ -254,22 +297,16 @@ class NgenicSensor(SensorEntity):
     def unique_id(self):
         return "%s-%s-%s" % (self._node.uuid(), self._measurement_type.name, "sensor")
 
+    @property
+    def device_info(self):
+        """Return the device (node) this sensor belongs to."""
+        return self._device_info
+
     @property
     def should_poll(self):
         """An update is pushed when device is updated"""
         return False
 
-    async def async_will_remove_from_hass(self):
-        """Remove updater when sensor is removed."""
-        if self._updater:
-            self._updater()
-            self._updater = None
-
-    def _setup_updater(self):
-        """Setup a timer that will execute an update every update interval"""
-        # async_track_time_interval returns a function that, when executed, will remove the timer
-        self._updater = async_track_time_interval(self._hass, self._async_update, self._update_interval)
-
     async def _async_fetch_measurement(self):
         """Fetch the measurement data from ngenic API.
         Return measurement formatted as intended to be displayed in hass.
@@ -283,18 +320,23 @@ class NgenicSensor(SensorEntity):
         """Fetch new state data for the sensor.
         This is the only method that should fetch new data for Home Assistant.
         """
+        if not self._breaker.allow_request():
+            # The API is failing, keep the last known state but flag it as stale
+            _LOGGER.debug("Circuit breaker open, skipping update (name=%s, type=%s)" % (self._name, self._measurement_type))
+            self._mark_stale()
+            return
+
         _LOGGER.debug("Fetch measurement (name=%s, type=%s)" % (self._name, self._measurement_type))
         try:
             new_state = await self._async_fetch_measurement()
-            self._available = True
-        except Exception:
-            # Don't throw an exception if a sensor fails to update.
-            # Instead, make the sensor unavailable.
-            _LOGGER.exception("Failed to update sensor '%s'" % self.unique_id)
-            self._available = False
+        except Exception as err:
+            self._handle_failure(err)
             return
-        
-        if self._state != new_state:
+
+        was_stale = self._stale
+        self._mark_fresh()
+
+        if self._state != new_state or was_stale:
             self._state = new_state
             _LOGGER.debug("New measurement: %f (name=%s, type=%s)" % (new_state, self._name, self._measurement_type))
             
@@ -307,6 +349,26 @@ class NgenicSensor(SensorEntity):
         else:
             _LOGGER.debug("No new measurement (old=%f, name=%s, type=%s)" % (new_state, self._name, self._measurement_type))
 
+class NgenicSeriesSensor(NgenicSensor):
+    """Representation of an Ngenic Sensor derived from today's series of measurements.
+    Sensors on the same node and measurement type share the fetched series.
+    """
+
+    def __init__(self, hass, ngenic, breaker, series_cache, node, device_info, name, update_interval, measurement_type):
+        super().__init__(hass, ngenic, breaker, node, device_info, name, update_interval, measurement_type)
+        self._series_cache = series_cache
+
+    def _record_success(self):
+        """The series cache reports to the circuit breaker."""
+
+    def _record_failure(self):
+        """The series cache reports to the circuit breaker."""
+
+    async def _async_fetch_series(self):
+        """Fetch today's measurements, divided into periods of SERIES_PERIOD"""
+        from_dt, to_dt = get_from_to_datetime()
+        return await self._series_cache.async_get(self._node, self._measurement_type, from_dt, to_dt, period=SERIES_PERIOD)
+
 class NgenicTempSensor(NgenicSensor):
     device_class = DEVICE_CLASS_TEMPERATURE
     state_class  = STATE_CLASS_MEASUREMENT
@@ -339,7 +401,7 @@ class NgenicPowerSensor(NgenicSensor):
         current = await get_measurement_value(self._node, measurement_type=self._measurement_type)
         return round(current*1000.0, 1)
         
-class NgenicEnergySensor(NgenicSensor):
+class NgenicEnergySensor(NgenicSeriesSensor):
     device_class = DEVICE_CLASS_ENERGY
     state_class  = STATE_CLASS_TOTAL_INCREASING
 
@@ -349,20 +411,46 @@ class NgenicEnergySensor(NgenicSensor):
         return ENERGY_KILO_WATT_HOUR
 
     async def _async_fetch_measurement(self):
-        """Ask for measurements for a duration.
-        This requires some further inputs, so we'll override the _async_fetch_measurement method.
+        """Sum today's energy.
+        The series is shared with the average power sensor.
         """
-        from_dt, to_dt = get_from_to_datetime()
-        # using datetime will return a list of measurements
-        # we'll use the last item in that list
-        current = await get_measurement_value(self._node, measurement_type=self._measurement_type, from_dt=from_dt, to_dt=to_dt)
-        return round(current, 1)
+        series = await self._async_fetch_series()
+        return round(series.sum(), 1)
         
     @property
     def name(self):
         """Return the name of the sensor."""
         return "%s %s" % (self._name, "energy")
 
+class NgenicAveragePowerSensor(NgenicSeriesSensor):
+    device_class = DEVICE_CLASS_POWER
+    state_class  = STATE_CLASS_MEASUREMENT
+
+    @property
+    def unit_of_measurement(self):
+        """Return the unit of measurement."""
+        return POWER_WATT
+
+    async def _async_fetch_measurement(self):
+        """Average power since midnight, derived from today's energy.
+        The NGenic API returns kWh but HA uses W so we need to multiply by 1000
+        """
+        series = await self._async_fetch_series()
+        # aware datetimes, so hours are right on days when DST starts or ends
+        hours = (dt_util.now() - dt_util.start_of_local_day()).total_seconds() / 3600.0
+        if hours <= 0:
+            return 0.0
+        return round(series.sum() / hours * 1000.0, 1)
+
+    @property
+    def name(self):
+        """Return the name of the sensor."""
+        return "%s %s" % (self._name, "average power today")
+
+    @property
+    def unique_id(self):
+        return "%s-%s-%s-average-today" % (self._node.uuid(), self._measurement_type.name, "sensor")
+
 class NgenicEnergySensorMonth(NgenicSensor):
     device_class = DEVICE_CLASS_ENERGY
 
@@ -0,0 +1,183 @@
+"""Streaming access to Ngenic measurement lists.
+
+When asking for measurements over a period, the Ngenic API returns a
+JSON array of measurements. Instead of materializing the whole array,
+the response is read in chunks and each measurement is decoded as soon
+as it is complete, so memory use does not grow with the size of the period.
+"""
+import json
+import logging
+
+import httpx
+
+from ngenicpy.const import API_URL, API_PATH
+from ngenicpy.exceptions import ClientException
+
+_LOGGER = logging.getLogger(__name__)
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789+-.eE"
+_LITERALS = ("true", "false", "null")
+
+# A measurement is well under a hundred characters, an item larger than
+# this is not a measurement and the body is treated as invalid
+MAX_ITEM_LENGTH = 4096
+
+def _is_truncated(err):
+    """Return True if a decode error is caused by the document ending too early,
+    rather than by invalid JSON.
+    """
+    if err.msg.startswith("Unterminated string"):
+        return True
+
+    rest = err.doc[err.pos:].rstrip(_WHITESPACE)
+    # the error is at the end of the document, or in a number or literal that may continue
+    return (
+        not rest
+        or all(c in _NUMBER_CHARS for c in rest)
+        or any(literal.startswith(rest) for literal in _LITERALS)
+    )
+
+async def async_iter_json_items(chunks):
+    """Iterate over the items of a JSON array as the text arrives.
+
+    `chunks` is an async iterator of text. If the document is a single
+    JSON value rather than an array, that value is yielded once.
+    Only the item currently being decoded is held in memory.
+    Raises ValueError as soon as the document is known to be invalid,
+    or if the array is never closed.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    started = False
+    is_array = False
+    # an array starts with an item (or "]"), and every item is followed by "," or "]"
+    expect_item = True
+    is_empty = True
+
+    async for chunk in chunks:
+        buf = buf[pos:] + chunk
+        pos = 0
+
+        if not started:
+            stripped = buf.lstrip(_WHITESPACE)
+            if not stripped:
+                buf = ""
+                continue
+            started = True
+            if stripped[0] == "[":
+                is_array = True
+                pos = len(buf) - len(stripped) + 1
+
+        if not is_array:
+            # a single value, wait for the whole document
+            if len(buf) > MAX_ITEM_LENGTH:
+                raise ValueError("JSON value is longer than %d characters" % MAX_ITEM_LENGTH)
+            continue
+
+        while True:
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+
+            if pos >= len(buf):
+                break
+
+            if not expect_item:
+                if buf[pos] == "]":
+                    # end of array, anything after it is ignored
+                    return
+                if buf[pos] != ",":
+                    raise ValueError("Expecting ',' or ']' at position %d: %r" % (pos, buf[pos:pos + 20]))
+                pos += 1
+                expect_item = True
+                continue
+
+            if buf[pos] == "]" and is_empty:
+                return
+
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError as err:
+                if not _is_truncated(err):
+                    raise
+                # item is incomplete, wait for more data
+                break
+
+            if not isinstance(item, (dict, list, str)):
+                # a number (or literal) is only complete when followed by a separator,
+                # otherwise it might continue in the next chunk
+                next_pos = end
+                while next_pos < len(buf) and buf[next_pos] in _WHITESPACE:
+                    next_pos += 1
+                if next_pos >= len(buf) or (next_pos == end and all(c in _NUMBER_CHARS for c in buf[end:])):
+                    break
+
+            pos = end
+            expect_item = False
+            is_empty = False
+            yield item
+
+        if len(buf) - pos > MAX_ITEM_LENGTH:
+            raise ValueError("JSON array item is longer than %d characters" % MAX_ITEM_LENGTH)
+
+    if not is_array:
+        rest = buf[pos:].strip(_WHITESPACE)
+        if rest:
+            yield json.loads(rest)
+        return
+
+    # a complete array returns when reaching "]"
+    raise ValueError("JSON array was not closed")
+
+async def async_iter_measurements(node, measurement_type, from_dt, to_dt, period=None):
+    """Iterate over measurements for a node and period.
+
+    This is a streaming counterpart to `Node.async_measurement` when
+    `from_dt` and `to_dt` are given. Each measurement is yielded as a
+    dict with `time` and `value`.
+    """
+    # ngenicpy keeps the tune and the http client on the node,
+    # reuse them so we share the connection pool with the rest of the integration.
+    # These are private attributes, which ties this to ngenicpy==0.3.3 (see manifest.json)
+    url = API_PATH["measurements"].format(tuneUuid=node._parentTune.uuid(), nodeUuid=node.uuid())
+    params = {
+        "type": measurement_type.value,
+        "from": from_dt,
+        "to": to_dt
+    }
+    if period:
+        params["period"] = period
+
+    _LOGGER.debug("GET (stream) %s with %s" % (url, params))
+    for is_retry in (False, True):
+        yielded = False
+        try:
+            async with node._session.stream("GET", "%s/%s" % (API_URL, url), params=params) as response:
+                response.raise_for_status()
+
+                if response.status_code == 204:
+                    # no measurements for the period
+                    return
+
+                async for item in async_iter_json_items(response.aiter_text()):
+                    yielded = True
+                    yield item
+            return
+        except httpx.CloseError as exc:
+            # Same as ngenicpy, retry once on a broken (keep-alive) connection.
+            # Items that have been yielded can't be taken back, so only retry if none were.
+            if is_retry or yielded:
+                raise ClientException("A request exception occurred: %s" % exc) from exc
+            _LOGGER.debug("Got a CloseError while trying to send request. Retry request once.")
+        except httpx.HTTPError as exc:
+            raise ClientException("A request exception occurred: %s" % exc) from exc
+        except ValueError as exc:
+            raise ClientException("Ngenic API return an invalid json body: %s" % exc) from exc
+
+async def async_last_measurement(node, measurement_type, from_dt, to_dt, period=None):
+    """Get the last measurement in a period, or None if there are no measurements."""
+    last = None
+    async for measurement in async_iter_measurements(node, measurement_type, from_dt, to_dt, period):
+        last = measurement
+    return last
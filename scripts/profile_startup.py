@@ -0,0 +1,166 @@
+"""Profile the startup of the Ngenic integration.
+
+Imports the integration and sets up a config entry in a Home Assistant core,
+against a simulated Ngenic API with one Tune and three nodes.
+Every API request is answered after a fixed latency, so setups can be compared
+without depending on the real API.
+
+Requires homeassistant and ngenicpy (see manifest.json) to be installed:
+
+    python scripts/profile_startup.py [PATH] [--latency SECONDS] [--runs N]
+
+PATH is a checkout containing custom_components/ngenic, this repository by default.
+To compare with another version, check it out in a separate worktree:
+
+    git worktree add /tmp/ngenic-old <commit>
+    python scripts/profile_startup.py /tmp/ngenic-old
+"""
+import argparse
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+# Imported by Home Assistant before any integration is loaded,
+# import them first so they are not counted as part of the integration
+IMPORT_PRELUDE = """
+import homeassistant.core, homeassistant.config_entries, homeassistant.helpers.entity_platform
+import homeassistant.components.sensor, homeassistant.components.climate
+"""
+
+# Time importing the integration (on the event loop) and then the
+# platforms (in the executor, or already done by older versions)
+IMPORT_TIMER = """
+import importlib, time
+start = time.perf_counter()
+importlib.import_module("custom_components.ngenic")
+middle = time.perf_counter()
+for platform in ("sensor", "climate"):
+    importlib.import_module("custom_components.ngenic." + platform)
+end = time.perf_counter()
+print("%f %f" % (middle - start, end - middle))
+"""
+
+TUNE = {"uuid": "t1", "tuneName": "Home", "name": "Home", "roomToControlUuid": "r1", "rooms": []}
+ROOM = {"uuid": "r1", "nodeUuid": "n1", "name": "Living", "targetTemperature": 21.0, "activeControl": True}
+NODES = [{"uuid": "n1", "type": 0}, {"uuid": "n2", "type": 1}, {"uuid": "n3", "type": 4}]
+NODE_TYPES = {
+    "n1": ["temperature_C", "humidity_relative_percent"],
+    "n2": ["temperature_C", "control_value_C"],
+    "n3": ["power_kW", "energy_kWH"]
+}
+
+def api_response(path):
+    """Return the simulated API response for a path."""
+    path = path.replace("/api/v3/", "")
+    parts = path.split("/")
+
+    if path == "tunes/":
+        return [TUNE]
+    if path == "tunes/t1":
+        return TUNE
+    if path == "tunes/t1/rooms/":
+        return [ROOM]
+    if path == "tunes/t1/rooms/r1":
+        return ROOM
+    if path == "tunes/t1/gateway/nodes/":
+        return NODES
+    if path.startswith("tunes/t1/gateway/nodes/"):
+        return next(node for node in NODES if node["uuid"] == parts[4])
+    if path.endswith("/types"):
+        return NODE_TYPES[parts[3]]
+    if path.endswith("/latest"):
+        return {"time": "2021-01-01T00:00:00Z", "value": 20.5}
+    if "/measurements/" in path:
+        return [{"time": "2021-01-01T%02d:00:00+00:00" % hour, "value": 0.5} for hour in range(24)]
+    raise ValueError("Unknown API path '%s'" % path)
+
+def patch_http_client(latency, requests):
+    """Make every httpx.AsyncClient send its requests to the simulated API."""
+    async def handler(request):
+        requests.append(request.url.path)
+        await asyncio.sleep(latency)
+        return httpx.Response(200, json=api_response(request.url.path))
+
+    init = httpx.AsyncClient.__init__
+
+    def patched_init(self, *args, **kwargs):
+        kwargs["transport"] = httpx.MockTransport(handler)
+        init(self, *args, **kwargs)
+
+    httpx.AsyncClient.__init__ = patched_init
+
+def time_imports(path, runs):
+    """Time the imports, each run in a new interpreter."""
+    env = dict(os.environ, PYTHONPATH=path)
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_PRELUDE + IMPORT_TIMER],
+            env=env, check=True, capture_output=True, text=True
+        ).stdout
+        results.append([float(value) for value in output.split()])
+    return results
+
+async def async_time_setup(path, requests):
+    """Set up a config entry, return the time it took."""
+    from homeassistant import config_entries
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers import area_registry, device_registry, entity_registry
+    from homeassistant.setup import async_setup_component
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        os.symlink(os.path.join(os.path.abspath(path), "custom_components"), os.path.join(config_dir, "custom_components"))
+
+        hass = HomeAssistant()
+        hass.config.config_dir = config_dir
+        hass.config.skip_pip = True
+        hass.data["entity_info"] = {}
+        await area_registry.async_load(hass)
+        await device_registry.async_load(hass)
+        await entity_registry.async_load(hass)
+        hass.config_entries = config_entries.ConfigEntries(hass, {})
+        await hass.config_entries.async_initialize()
+        await async_setup_component(hass, "ngenic", {})
+
+        entry = config_entries.ConfigEntry(1, "ngenic", "Home", {"token": "token"}, "user")
+        requests.clear()
+        start = time.perf_counter()
+        await hass.config_entries.async_add(entry)
+        await hass.async_block_till_done()
+        elapsed = time.perf_counter() - start
+
+        if entry.state is not config_entries.ConfigEntryState.LOADED:
+            raise RuntimeError("Setup failed: %s" % entry.state)
+
+        await hass.async_stop(force=True)
+    return elapsed
+
+def print_range(label, values, unit="ms", scale=1000.0):
+    print("%-55s %6.0f - %6.0f %s" % (label, min(values) * scale, max(values) * scale, unit))
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile the startup of the Ngenic integration.")
+    parser.add_argument("path", nargs="?", default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per API request")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    imports = time_imports(args.path, args.runs)
+    print_range("Importing the integration", [integration for integration, _ in imports])
+    print_range("Importing the platforms", [platforms for _, platforms in imports])
+
+    requests = []
+    patch_http_client(args.latency, requests)
+    setups = [asyncio.run(async_time_setup(args.path, requests)) for _ in range(args.runs)]
+    print_range("Setup of a config entry (%d API requests)" % len(requests), setups)
+
+if __name__ == "__main__":
+    main()